@@ -1,5 +1,149 @@
+import re
+import sys
+from pathlib import Path
+
 import pandas as pd
 
+# Vendored Python port of flatted (ships with the backend's node_modules).
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'backend' / 'node_modules' / 'flatted' / 'python'))
+import flatted  # noqa: E402
+
+# Pre-classified export for the Node backend: one flatted document per line,
+# each holding up to EXPORT_CHUNK_SIZE records.
+EXPORT_PATH = 'sms_records.flatted.jsonl'
+EXPORT_CHUNK_SIZE = 500
+
+# Same keyword rules and order as backend/src/scripts/analyzeSampleSMS.js
+CATEGORY_KEYWORDS = [
+    ('energy_electricity', ['electricity', 'power', 'msedcl', 'tata power']),
+    ('energy_fuel', ['diesel', 'petrol', 'fuel', 'bpcl', 'hpcl', 'iocl']),
+    ('water', ['water', 'jal']),
+    ('transportation', ['transport', 'freight', 'shipping', 'delivery', 'courier']),
+    ('raw_materials', ['steel', 'aluminium', 'aluminum', 'plastic', 'raw material']),
+    ('waste_management', ['waste', 'disposal', 'recycl']),
+    ('telecom', ['recharge', 'prepaid', 'mobile']),
+    ('banking_transaction', ['credited', 'debited', 'transfer', 'upi', 'imps', 'neft']),
+    ('otp_verification', ['otp', 'verification', 'code']),
+    ('ecommerce', ['order', 'amazon', 'flipkart', 'shopping']),
+    ('food_delivery', ['zomato', 'swiggy', 'food']),
+]
+
+# Same merchant list and amount pattern as backend/src/services/smsService.js
+MERCHANTS = [
+    'amazon', 'flipkart', 'swiggy', 'zomato', 'uber', 'ola',
+    'paytm', 'phonepe', 'google pay', 'razorpay', 'stripe',
+    'electricity board', 'water board', 'gas company',
+]
+AMOUNT_RE = re.compile(r'(?:rs\.?|₹|inr)\s*(\d+(?:,\d{3})*(?:\.\d{2})?)', re.I)
+CREDIT_WORDS = ('credited', 'received', 'refund')
+DEBIT_WORDS = ('debited', 'paid', 'spent', 'charged', 'sent', 'withdrawn')
+
+# The SMS labels above, mapped onto the vocabulary dataProcessorAgent accepts
+# (categoryKeywords / validTransactionTypes); anything else gets re-classified.
+BACKEND_CATEGORY = {
+    'energy_electricity': 'energy',
+    'energy_fuel': 'energy',
+    'water': 'water',
+    'transportation': 'transportation',
+    'raw_materials': 'raw_materials',
+    'waste_management': 'waste_management',
+    'telecom': 'utilities',
+}
+ENERGY_SUBCATEGORY = {'energy_electricity': 'grid', 'energy_fuel': 'fuel'}
+BACKEND_TRANSACTION_TYPE = {
+    'energy_electricity': 'utility',
+    'water': 'utility',
+    'telecom': 'utility',
+    'energy_fuel': 'transport',
+    'transportation': 'transport',
+    'raw_materials': 'purchase',
+    'ecommerce': 'purchase',
+}
+DIRECTION_TRANSACTION_TYPE = {'credit': 'sale', 'debit': 'expense'}
+
+
+def classify_sms_category(text):
+    for category, keywords in CATEGORY_KEYWORDS:
+        if any(keyword in text for keyword in keywords):
+            return category
+    return 'unknown'
+
+
+def classify_direction(text):
+    if any(word in text for word in CREDIT_WORDS):
+        return 'credit'
+    if any(word in text for word in DEBIT_WORDS):
+        return 'debit'
+    return 'other'
+
+
+def backend_transaction_type(sms_category, direction):
+    return BACKEND_TRANSACTION_TYPE.get(sms_category) or DIRECTION_TRANSACTION_TYPE.get(direction, 'other')
+
+
+def extract_amount(text):
+    match = AMOUNT_RE.search(text)
+    return float(match.group(1).replace(',', '')) if match else None
+
+
+def build_records(df):
+    """
+    Classified/extracted records shaped like the backend's SMS transactions.
+    vendor is the plain name the backend expects; records from the same sender
+    share one sender dict and records with the same vendor share one
+    vendorInfo dict, so flatted stores each only once.
+    """
+    senders = {}
+    vendors = {}
+    records = []
+    for _, row in df.iterrows():
+        address = str(row['senderAddress'])
+        description = str(row['text']).replace('_x000D_', '')
+        text = description.lower()
+
+        sender = senders.get(address)
+        if sender is None:
+            # Indian DLT headers look like "AX-PAYTMB": route prefix + header
+            sender = {'address': address, 'header': address.split('-', 1)[-1]}
+            senders[address] = sender
+
+        vendor_name = next((m.title() for m in MERCHANTS if m in text), sender['header'])
+        vendor_info = vendors.get(vendor_name)
+        if vendor_info is None:
+            vendor_info = vendors[vendor_name] = {'name': vendor_name}
+
+        sms_category = classify_sms_category(text)
+        direction = classify_direction(text)
+        record = {
+            'source': 'sms',
+            'sourceId': str(row['id']),
+            'date': str(row['updateAt']),
+            'sender': sender,
+            'vendor': vendor_name,
+            'vendorInfo': vendor_info,
+            'category': BACKEND_CATEGORY.get(sms_category, 'other'),
+            'transactionType': backend_transaction_type(sms_category, direction),
+            'smsCategory': sms_category,
+            'direction': direction,
+            'amount': extract_amount(text),
+            'currency': 'INR',
+            'description': description,
+        }
+        if sms_category in ENERGY_SUBCATEGORY:
+            record['subcategory'] = ENERGY_SUBCATEGORY[sms_category]
+        records.append(record)
+    return records
+
+
+def export_records(records, path=EXPORT_PATH, chunk_size=EXPORT_CHUNK_SIZE):
+    # Standard flatted output, so the backend reads each line with
+    # require('flatted').parse(line).
+    with open(path, 'w', encoding='utf-8') as f:
+        for start in range(0, len(records), chunk_size):
+            chunk = {'offset': start, 'records': records[start:start + chunk_size]}
+            f.write(flatted.stringify(chunk, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
 # Read the Excel file
 df = pd.read_excel('samplesms.xlsx')
 
@@ -21,6 +165,10 @@ with open('sms_analysis.txt', 'w', encoding='utf-8') as f:
 
 print("Analysis saved to sms_analysis.txt")
 
+records = build_records(df)
+export_records(records)
+print(f"Exported {len(records)} classified records to {EXPORT_PATH}")
+
 # Also print unique senders
 print("\nUnique senders:")
 for sender in df['senderAddress'].unique()[:50]:
@@ -0,0 +1,79 @@
+"""
+Benchmark the SVG preprocessing stage against the original per-character
+sanitizer on large SVGs built from the repo assets.
+
+Run:
+  python3 docs/pitches/bench_svg_preprocess.py [--mb 8] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from svg_preprocess import preprocess_svg, sanitize_svg
+
+ROOT = Path(__file__).resolve().parent
+ASSETS_SVG_DIR = ROOT / "assets"
+
+
+def legacy_sanitize_svg(raw: bytes) -> bytes:
+    # The sanitizer build_pitches_pptx.py used before svg_preprocess.py.
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        text = raw.decode("cp1252")
+
+    def _ok(ch: str) -> bool:
+        o = ord(ch)
+        if ch in ("\t", "\n", "\r"):
+            return True
+        if o < 0x20:
+            return False
+        if 0x7F <= o <= 0x9F:
+            return False
+        return True
+
+    return "".join(ch for ch in text if _ok(ch)).encode("utf-8")
+
+
+def make_large_svg(svg: Path, target_bytes: int) -> bytes:
+    """Repeats the body of an asset inside one <svg> until it reaches target_bytes."""
+    raw = svg.read_bytes()
+    head, _, rest = raw.partition(b">")
+    body = rest.rsplit(b"</svg>", 1)[0]
+    chunk = b"<!-- exported by editor -->" + body
+    return head + b">" + chunk * max(1, target_bytes // len(chunk)) + b"</svg>"
+
+
+def best_of(fn, data: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=8.0, help="size of each synthetic SVG")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'asset':<32} {'MB':>5} {'legacy s':>9} {'sanitize s':>11} {'preprocess s':>13} {'speedup':>8}  same")
+    for svg in sorted(ASSETS_SVG_DIR.glob("*.svg")):
+        data = make_large_svg(svg, int(args.mb * 1024 * 1024))
+        legacy = best_of(legacy_sanitize_svg, data, args.repeat)
+        fast = best_of(sanitize_svg, data, args.repeat)
+        full = best_of(preprocess_svg, data, args.repeat)
+        same = legacy_sanitize_svg(data) == sanitize_svg(data)
+        print(
+            f"{svg.name:<32} {len(data) / 1e6:>5.1f} {legacy:>9.3f} {fast:>11.3f} {full:>13.3f}"
+            f" {legacy / fast:>7.1f}x  {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,33 @@
 """
 Generate PowerPoint pitch decks (Investor / MSME / Bank) using the repo's
 existing markdown narratives + SVG product visuals under docs/pitches/assets/.
+
+Slide content lives in declarative specs under docs/pitches/decks/; only decks
+whose spec, referenced assets or layout code changed are rebuilt (--force
+rebuilds everything). --batch builds co-branded variants of a deck from a
+CSV/JSONL of personalization records.
 """
 
 from __future__ import annotations
 
+import argparse
+import csv
+import hashlib
+import inspect
+import io
+import json
+import math
 import os
-from dataclasses import dataclass
+import struct
+import time
+import zipfile
+import zlib
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Callable, Iterator
 
 import cairosvg
 from pptx import Presentation
@@ -16,11 +36,31 @@ from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
 from pptx.enum.text import PP_ALIGN
 from pptx.util import Inches, Pt
 
+from svg_preprocess import preprocess_svg
+
 
 ROOT = Path(__file__).resolve().parent
 ASSETS_SVG_DIR = ROOT / "assets"
 ASSETS_PNG_DIR = ROOT / "assets_png"
 OUT_DIR = ROOT / "pptx"
+DECK_SPEC_DIR = ROOT / "decks"
+DECK_NAMES = ("investor", "msme", "bank", "partners-channels")
+# Fingerprints of the decks written by the last build; lives next to pptx/.
+DECK_MANIFEST = ROOT / "pptx.manifest.json"
+BUILD_REPORT = ROOT / "build-report.json"
+# Content-hash cache for rasterized assets; lives next to assets_png/.
+PNG_MANIFEST = ROOT / "assets_png.manifest.json"
+RENDERER = f"cairosvg {cairosvg.__version__}, zlib level 9"
+
+# Widths (inches) at which the slide helpers place images, and the density
+# they are rendered for. 150 ppi matches PowerPoint's own "Web" compression
+# preset and stays sharp on 1080p/1440p projection of a 13.333in slide.
+IMAGE_SLIDE_WIDTH_IN = 11.333
+TWO_COL_IMAGE_WIDTH_IN = 6.1
+PLACEMENT_WIDTHS_IN = (IMAGE_SLIDE_WIDTH_IN, TWO_COL_IMAGE_WIDTH_IN)
+TARGET_DPI = 150
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
 
 
 def _emu(inches: float) -> int:
@@ -33,29 +73,8 @@ def ensure_dirs() -> None:
     OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def svg_to_png(svg_path: Path, png_path: Path, *, width_px: int = 2200) -> None:
+def render_png(cleaned: bytes, png_path: Path, *, width_px: int = 2200) -> None:
     # PPT renders PNGs reliably; SVG support is inconsistent across versions.
-    # Some repo SVGs may include stray control characters or CP1252 punctuation,
-    # which makes them invalid XML for parsers like ElementTree.
-    raw = svg_path.read_bytes()
-    try:
-        text = raw.decode("utf-8")
-    except UnicodeDecodeError:
-        text = raw.decode("cp1252")
-
-    def _ok(ch: str) -> bool:
-        o = ord(ch)
-        if ch in ("\t", "\n", "\r"):
-            return True
-        if o < 0x20:
-            return False
-        # XML 1.0 disallows C1 control chars too.
-        if 0x7F <= o <= 0x9F:
-            return False
-        return True
-
-    cleaned = "".join(ch for ch in text if _ok(ch)).encode("utf-8")
-
     cairosvg.svg2png(
         bytestring=cleaned,
         write_to=str(png_path),
@@ -64,19 +83,171 @@ def svg_to_png(svg_path: Path, png_path: Path, *, width_px: int = 2200) -> None:
     )
 
 
-def convert_all_svgs() -> dict[str, Path]:
+def svg_to_png(svg_path: Path, png_path: Path, *, width_px: int = 2200) -> None:
+    render_png(preprocess_svg(svg_path.read_bytes()), png_path, width_px=width_px)
+
+
+def optimize_png(png_path: Path) -> None:
     """
-    Returns a mapping from asset stem to PNG path, e.g.:
-      {"product-dashboard-web": ".../assets_png/product-dashboard-web.png"}
+    Losslessly shrinks a PNG: merges the image data into one IDAT chunk
+    recompressed at zlib level 9 and drops text/timestamp chunks. The file
+    is only rewritten when the result is smaller.
+    """
+    data = png_path.read_bytes()
+    if not data.startswith(PNG_SIGNATURE):
+        return
+    chunks: list[tuple[bytes, bytes]] = []
+    idat: list[bytes] = []
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        (length,) = struct.unpack(">I", data[pos : pos + 4])
+        ctype = data[pos + 4 : pos + 8]
+        body = data[pos + 8 : pos + 8 + length]
+        pos += 12 + length
+        if ctype == b"IDAT":
+            idat.append(body)
+        elif ctype not in (b"tEXt", b"zTXt", b"iTXt", b"tIME"):
+            chunks.append((ctype, body))
+    if not idat or not chunks or chunks[-1][0] != b"IEND":
+        return
+
+    chunks.insert(len(chunks) - 1, (b"IDAT", zlib.compress(zlib.decompress(b"".join(idat)), 9)))
+    out = bytearray(PNG_SIGNATURE)
+    for ctype, body in chunks:
+        out += struct.pack(">I", len(body)) + ctype + body
+        out += struct.pack(">I", zlib.crc32(ctype + body) & 0xFFFFFFFF)
+    if len(out) < len(data):
+        png_path.write_bytes(bytes(out))
+
+
+def placement_px(width_in: float, *, dpi: int = TARGET_DPI) -> int:
+    return math.ceil(width_in * dpi)
+
+
+def variant_widths(*, dpi: int = TARGET_DPI) -> list[int]:
+    """Pixel widths to render each asset at, largest first."""
+    return sorted({placement_px(w, dpi=dpi) for w in PLACEMENT_WIDTHS_IN}, reverse=True)
+
+
+def variant_png_path(png: Path, width_px: int) -> Path:
+    return png.with_name(f"{png.stem}@{width_px}w.png")
+
+
+def placed_png(image_path: Path, width_in: float) -> Path:
+    """
+    Picks the rendered variant of image_path that matches a placement width,
+    falling back to image_path itself (the largest variant). Reusing the same
+    file for equal placements lets python-pptx share one image part.
+    """
+    variant = variant_png_path(image_path, placement_px(width_in))
+    return variant if variant.exists() else image_path
+
+
+def raster_cache_key(cleaned: bytes, *, width_px: int) -> str:
+    h = hashlib.sha256(cleaned)
+    h.update(f"|{width_px}|{RENDERER}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_png_manifest() -> dict[str, str]:
+    """
+    Returns {png file name: cache key} from the last build; empty if the
+    manifest is missing or unreadable (everything gets re-rasterized).
     """
+    try:
+        data = json.loads(PNG_MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_png_manifest(manifest: dict[str, str]) -> None:
+    tmp = PNG_MANIFEST.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    tmp.replace(PNG_MANIFEST)
+
+
+@dataclass(frozen=True)
+class RasterJob:
+    stem: str
+    png: Path
+    cleaned: bytes
+    key: str
+    width_px: int
+
+
+def png_dimensions(png_path: Path) -> tuple[int, int]:
+    # Width/height from the IHDR chunk, which always follows the signature.
+    with png_path.open("rb") as f:
+        head = f.read(24)
+    return struct.unpack(">II", head[16:24])
+
+
+def run_raster_job(job: RasterJob) -> dict:
+    """Renders one variant; returns its timing and output stats for the build report."""
+    started = time.perf_counter()
+    render_png(job.cleaned, job.png, width_px=job.width_px)
+    optimize_png(job.png)
+    width, height = png_dimensions(job.png)
+    return {
+        "png": job.png.name,
+        "seconds": round(time.perf_counter() - started, 4),
+        "width_px": width,
+        "height_px": height,
+        "bytes": job.png.stat().st_size,
+    }
+
+
+def plan_svg_conversions(
+    *, dpi: int = TARGET_DPI, prune_defs: bool = False
+) -> tuple[dict[str, Path], dict[str, str], list[RasterJob]]:
+    """
+    Returns (pngs, manifest, jobs): the PNG path for every asset stem, the
+    cache keys of PNGs that are already up to date, and the rasterization
+    jobs still needed for the rest. A job's key belongs in the manifest
+    once it has run.
+
+    Each asset is rendered once per placement width (see variant_widths):
+    the largest as "<stem>.png", smaller ones as "<stem>@<px>w.png".
+    """
+    previous = load_png_manifest()
+    manifest: dict[str, str] = {}
     pngs: dict[str, Path] = {}
+    jobs: list[RasterJob] = []
+    widths = variant_widths(dpi=dpi)
     for svg in sorted(ASSETS_SVG_DIR.glob("*.svg")):
         png = ASSETS_PNG_DIR / f"{svg.stem}.png"
         try:
-            svg_to_png(svg, png)
+            cleaned = preprocess_svg(svg.read_bytes(), prune_defs=prune_defs)
         except Exception as e:  # noqa: BLE001 - surfaced with context
-            raise RuntimeError(f"Failed converting SVG to PNG: {svg}") from e
+            raise RuntimeError(f"Failed reading SVG: {svg}") from e
+        for i, width_px in enumerate(widths):
+            target = png if i == 0 else variant_png_path(png, width_px)
+            key = raster_cache_key(cleaned, width_px=width_px)
+            if previous.get(target.name) == key and target.exists():
+                manifest[target.name] = key
+            else:
+                jobs.append(RasterJob(svg.stem, target, cleaned, key, width_px))
         pngs[svg.stem] = png
+    return pngs, manifest, jobs
+
+
+def convert_all_svgs(*, dpi: int = TARGET_DPI, prune_defs: bool = False) -> dict[str, Path]:
+    """
+    Returns a mapping from asset stem to PNG path, e.g.:
+      {"product-dashboard-web": ".../assets_png/product-dashboard-web.png"}
+
+    PNGs whose cache key (preprocessed SVG bytes + width + renderer version)
+    matches the manifest are reused instead of being rasterized again.
+    """
+    pngs, manifest, jobs = plan_svg_conversions(dpi=dpi, prune_defs=prune_defs)
+    for job in jobs:
+        try:
+            run_raster_job(job)
+        except Exception as e:  # noqa: BLE001 - surfaced with context
+            raise RuntimeError(f"Failed converting SVG to PNG: {job.png.name}") from e
+        manifest[job.png.name] = job.key
+    save_png_manifest(manifest)
     return pngs
 
 
@@ -235,7 +406,12 @@ def add_image_slide(
     _set_run_font(r, size_pt=32, color=THEME.title, bold=True)
 
     # Image centered, large
-    slide.shapes.add_picture(str(image_path), Inches(1.0), Inches(1.6), width=Inches(11.333))
+    slide.shapes.add_picture(
+        str(placed_png(image_path, IMAGE_SLIDE_WIDTH_IN)),
+        Inches(1.0),
+        Inches(1.6),
+        width=Inches(IMAGE_SLIDE_WIDTH_IN),
+    )
 
     if caption:
         c = slide.shapes.add_textbox(Inches(1.0), Inches(7.02), Inches(11.333), Inches(0.4))
@@ -280,7 +456,12 @@ def add_two_col_bullets_image(
         para.font.color.rgb = THEME.body
 
     # Right image
-    slide.shapes.add_picture(str(image_path), Inches(6.8), Inches(1.75), width=Inches(6.1))
+    slide.shapes.add_picture(
+        str(placed_png(image_path, TWO_COL_IMAGE_WIDTH_IN)),
+        Inches(6.8),
+        Inches(1.75),
+        width=Inches(TWO_COL_IMAGE_WIDTH_IN),
+    )
 
     if image_caption:
         c = slide.shapes.add_textbox(Inches(6.8), Inches(7.02), Inches(6.1), Inches(0.35))
@@ -293,530 +474,547 @@ def add_two_col_bullets_image(
         _set_run_font(cr, size_pt=12, color=THEME.muted)
 
 
-def build_investor_deck(pngs: dict[str, Path]) -> Path:
-    prs = make_presentation()
-    add_title_slide(
-        prs,
-        top_title="MAP Day Update",
-        line1="Carbon Intelligence",
-        line2="Investor Pitch",
-        footer="Confidential",
-    )
-
-    add_section_slide(prs, title="The Story", subtitle="Data → Action → Finance for MSMEs and Banks")
-
-    add_bullets_slide(
-        prs,
-        title="One-liner",
-        bullets=[
-            "Carbon Intelligence helps MSMEs measure emissions, reduce costs, and prove progress—then uses that verified data to unlock better-priced green finance for banks.",
-        ],
-    )
-
-    add_two_col_bullets_image(
-        prs,
-        title="The problem (why now)",
-        bullets=[
-            "MSMEs face rising sustainability requests from buyers and lenders.",
-            "Operational data is fragmented (emails, folders, spreadsheets).",
-            "Banks have an ESG data gap: inconsistent SME data, expensive verification.",
-            "Result: compliance is painful, decarbonization is slow, finance is mispriced.",
-        ],
-        image_path=pngs["platform-loop"],
-        image_caption="We compound: measure → improve → prove → finance",
-    )
+SLIDE_BUILDERS: dict[str, Callable[..., None]] = {
+    "title": add_title_slide,
+    "section": add_section_slide,
+    "bullets": add_bullets_slide,
+    "image": add_image_slide,
+    "two_col": add_two_col_bullets_image,
+}
 
-    add_image_slide(
-        prs,
-        title="Product overview (web experience)",
-        image_path=pngs["product-dashboard-web"],
-        caption="Card-based dashboard: score, quick stats, trends, and actions",
-    )
 
-    add_section_slide(prs, title="Product Proof", subtitle="What exists in the UI today")
+@dataclass(frozen=True)
+class DeckSpec:
+    """
+    A deck as data, loaded from decks/<name>.json:
+      {"output": "<file>.pptx", "slides": [{"type": "bullets", "title": ..., ...}]}
+    Each slide's "type" picks a SLIDE_BUILDERS helper and the remaining keys
+    are its keyword arguments; "image" names an asset stem and is passed on
+    as image_path.
+    """
 
-    add_image_slide(prs, title="Guided carbon assessment", image_path=pngs["product-carbon-assessment"])
-    add_image_slide(prs, title="Document intelligence (evidence layer)", image_path=pngs["product-document-management"])
-    add_image_slide(prs, title="Reporting (shareable outcomes)", image_path=pngs["product-reporting"])
-    add_image_slide(prs, title="Green loans (conversion into finance)", image_path=pngs["product-green-loans"])
+    name: str
+    output: str
+    slides: tuple[dict, ...]
 
-    add_section_slide(prs, title="Go-to-market + Model", subtitle="Wedge now, expand into finance workflows")
+    @property
+    def path(self) -> Path:
+        return DECK_SPEC_DIR / f"{self.name}.json"
 
-    add_bullets_slide(
-        prs,
-        title="Market wedge and expansion",
-        bullets=[
-            "Wedge: MSME carbon assessment + reporting + ROI-based recommendations (fast time-to-value).",
-            "Expand: evidence/audit packs, supplier requests, benchmarking, continuous monitoring.",
-            "Integrate: bank/fintech green products (eligibility, pricing, monitoring).",
-        ],
-    )
+    @property
+    def assets(self) -> tuple[str, ...]:
+        return tuple(sorted({slide["image"] for slide in self.slides if "image" in slide}))
 
-    add_bullets_slide(
-        prs,
-        title="Business model",
-        bullets=[
-            "SaaS (MSME): subscription per company/site, tiered by features.",
-            "Usage: per report export, per processed document, per audit pack.",
-            "Bank revenue: platform fee for origination enablement + monitoring (or referral/origination economics).",
-            "Future: services marketplace + carbon credit rails.",
-        ],
-    )
 
-    add_bullets_slide(
-        prs,
-        title="Defensibility",
-        bullets=[
-            "Workflow lock-in: once reporting + documents + recommendations are embedded, switching costs rise.",
-            "Data moat: labeled activity + document data improves benchmarks and underwriting signals over time.",
-            "Distribution: banks and anchor enterprises can onboard MSMEs via portfolio/supply-chain programs.",
-        ],
-    )
+def load_deck_spec(name: str) -> DeckSpec:
+    path = DECK_SPEC_DIR / f"{name}.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    for i, slide in enumerate(data["slides"]):
+        if slide.get("type") not in SLIDE_BUILDERS:
+            raise ValueError(f"{path}: slide {i + 1} has unknown type {slide.get('type')!r}")
+    return DeckSpec(name=name, output=data["output"], slides=tuple(data["slides"]))
 
-    add_bullets_slide(
-        prs,
-        title="Milestones to prove next (fundraising-ready)",
-        bullets=[
-            "Repeatable acquisition via bank or supply-chain onboarding channel.",
-            "Retention/expansion: documents processed, reports exported, actions implemented.",
-            "Outcome metrics: ₹ cost savings and kg CO₂ reduction per MSME cohort.",
-            "Bank proof: faster credit files and improved portfolio coverage/monitoring.",
-        ],
-    )
 
-    add_bullets_slide(
-        prs,
-        title="The ask",
-        bullets=[
-            "Capital to accelerate distribution partnerships and product depth in evidence + green lending workflows.",
-            "Warm intros to banks/anchor enterprises to run portfolio or supply-chain pilots.",
-        ],
-        note="Replace this slide with your specific raise amount, runway, and milestones.",
-    )
-
-    out = OUT_DIR / "Carbon_Intelligence_Investor_Pitch.pptx"
-    prs.save(out)
-    return out
-
-
-def build_msme_deck(pngs: dict[str, Path]) -> Path:
+def render_deck(spec: DeckSpec, pngs: dict[str, Path]) -> Presentation:
     prs = make_presentation()
-    add_title_slide(
-        prs,
-        top_title="MAP Day Update",
-        line1="Carbon Intelligence",
-        line2="Pitch for MSMEs",
-        footer="Customer deck",
-    )
-
-    add_image_slide(
-        prs,
-        title="The promise",
-        image_path=pngs["product-dashboard-web"],
-        caption="Measure footprint, cut costs, and generate reports—without spreadsheets",
-    )
-
-    add_bullets_slide(
-        prs,
-        title="What you get (clear benefits)",
-        bullets=[
-            "Win more customers: share sustainability reports + evidence when asked.",
-            "Reduce waste: recommendations prioritized by impact, savings, and payback.",
-            "Get audit-ready faster: organize bills/invoices with a clean evidence trail.",
-            "Access green finance: convert performance into eligibility and better pricing.",
-        ],
-    )
-
-    add_section_slide(prs, title="How it works", subtitle="A simple 4-step flow")
-
-    add_two_col_bullets_image(
-        prs,
-        title="1) Guided carbon assessment",
-        bullets=[
-            "Answer a short step-by-step questionnaire across energy, transport, materials, water/waste, and processes.",
-            "Receive total CO₂, category split, scopes (1/2/3), and a carbon score.",
-        ],
-        image_path=pngs["product-carbon-assessment"],
-    )
-
-    add_two_col_bullets_image(
-        prs,
-        title="2) Recommendations with ROI",
-        bullets=[
-            "Not generic tips: each action includes priority, estimated savings (₹), payback (months), and CO₂ reduction.",
-            "Pick quick wins first, plan upgrades next (solar, efficiency, process improvements).",
-        ],
-        image_path=pngs["product-reporting"],
-        image_caption="Track actions and results in reporting",
-    )
+    for slide in spec.slides:
+        kwargs = {k: v for k, v in slide.items() if k not in ("type", "image")}
+        if "image" in slide:
+            kwargs["image_path"] = pngs[slide["image"]]
+        SLIDE_BUILDERS[slide["type"]](prs, **kwargs)
+    return prs
 
-    add_two_col_bullets_image(
-        prs,
-        title="3) Keep documents report-ready",
-        bullets=[
-            "Upload bills/invoices once; auto-extract key fields and compute carbon signals.",
-            "Detect duplicates to reduce errors and create an audit-friendly evidence pack.",
-            "Stop hunting for files when customers or auditors request proof.",
-        ],
-        image_path=pngs["product-document-management"],
-    )
 
-    add_two_col_bullets_image(
-        prs,
-        title="4) Generate reports you can share",
-        bullets=[
-            "Export reports for customers, internal reviews, tenders, and compliance.",
-            "Show progress over time: footprint trend + actions implemented.",
-        ],
-        image_path=pngs["product-reporting"],
-    )
+def build_deck(spec: DeckSpec, pngs: dict[str, Path]) -> Path:
+    out = OUT_DIR / spec.output
+    render_deck(spec, pngs).save(out)
+    return out
 
-    add_section_slide(prs, title="Green finance", subtitle="Convert sustainability into capital")
-
-    add_two_col_bullets_image(
-        prs,
-        title="Green loan enablement",
-        bullets=[
-            "Plan a reduction project (solar, machinery upgrade, waste systems).",
-            "Check eligibility up front and see transparent terms.",
-            "Submit a cleaner application using verified activity + plan data.",
-        ],
-        image_path=pngs["product-green-loans"],
-    )
 
-    add_bullets_slide(
-        prs,
-        title="MSME ROI framing",
-        bullets=[
-            "Time saved: less manual reporting and document hunting.",
-            "Cost savings: energy/fuel/process improvements with clear payback.",
-            "Revenue enablement: meet buyer requirements and improve trust.",
-            "Better financing access: qualify for green loans and incentives.",
-        ],
-    )
+def build_investor_deck(pngs: dict[str, Path]) -> Path:
+    return build_deck(load_deck_spec("investor"), pngs)
 
-    add_bullets_slide(
-        prs,
-        title="Next steps",
-        bullets=[
-            "Pick your sector and baseline period (last 3–12 months).",
-            "Upload your latest bills/invoices and complete the assessment.",
-            "Review prioritized actions and export your first customer-ready report.",
-        ],
-    )
 
-    out = OUT_DIR / "Carbon_Intelligence_MSME_Pitch.pptx"
-    prs.save(out)
-    return out
+def build_msme_deck(pngs: dict[str, Path]) -> Path:
+    return build_deck(load_deck_spec("msme"), pngs)
 
 
 def build_bank_deck(pngs: dict[str, Path]) -> Path:
-    prs = make_presentation()
-    add_title_slide(
-        prs,
-        top_title="MAP Day Update",
-        line1="Carbon Intelligence",
-        line2="Pitch for Banks",
-        footer="Customer deck",
-    )
+    return build_deck(load_deck_spec("bank"), pngs)
 
-    add_image_slide(
-        prs,
-        title="The promise",
-        image_path=pngs["platform-loop"],
-        caption="Turn SME sustainability data into underwriting + reporting advantage",
-    )
 
-    add_bullets_slide(
-        prs,
-        title="Why banks use this (value drivers)",
-        bullets=[
-            "Grow green lending efficiently: guided onboarding + evidence pack reduces friction.",
-            "Better risk signals: score, emissions trajectory, action adoption, document-backed activity data.",
-            "Portfolio visibility: standardized outputs across MSMEs for dashboards and disclosures.",
-            "Lower cost-to-serve: fewer document chases, fewer data quality issues, faster files.",
-        ],
-    )
+def build_partners_channels_deck(pngs: dict[str, Path]) -> Path:
+    return build_deck(load_deck_spec("partners-channels"), pngs)
 
-    add_section_slide(prs, title="Bank-ready outputs", subtitle="Standardized, comparable, defensible")
-
-    add_two_col_bullets_image(
-        prs,
-        title="1) Verified evidence layer (documents)",
-        bullets=[
-            "MSMEs upload bills/invoices; we structure fields and maintain an audit trail.",
-            "Duplicate detection improves cleanliness and reduces fraud/over-claim risk.",
-            "Creates a reusable sustainability evidence pack per borrower.",
-        ],
-        image_path=pngs["product-document-management"],
-    )
 
-    add_two_col_bullets_image(
-        prs,
-        title="2) Carbon + ESG outputs (comparable across customers)",
-        bullets=[
-            "Total CO₂ + category breakdown; scopes 1/2/3 split.",
-            "Carbon score + trend over time; recommended actions with payback.",
-            "Consistent schema enables portfolio rollups and benchmarking.",
-        ],
-        image_path=pngs["product-reporting"],
-    )
+def load_deck_manifest() -> dict[str, str]:
+    """Returns {deck name: fingerprint} of the decks written by the last build."""
+    try:
+        data = json.loads(DECK_MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
 
-    add_two_col_bullets_image(
-        prs,
-        title="3) Green loan enablement (origination workflow)",
-        bullets=[
-            "Eligibility checks + transparent term preview based on policy rules and carbon score.",
-            "Cleaner application files reduce back-and-forth and speed approvals.",
-            "Ongoing monitoring ties disbursement impact to measurable reductions.",
-        ],
-        image_path=pngs["product-green-loans"],
-    )
 
-    add_section_slide(prs, title="Deployment models", subtitle="3 common ways banks roll this out")
+def save_deck_manifest(manifest: dict[str, str]) -> None:
+    tmp = DECK_MANIFEST.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    tmp.replace(DECK_MANIFEST)
 
-    add_bullets_slide(
-        prs,
-        title="Rollout options",
-        bullets=[
-            "Model A — Bank-led onboarding: offer to MSME customers to prepare green-loan-ready profiles.",
-            "Model B — Co-lending / partner channel: embed into partner program and share standardized outputs.",
-            "Model C — Portfolio monitoring: enroll existing borrowers for ongoing capture and early-warning signals.",
-        ],
-    )
 
-    add_bullets_slide(
-        prs,
-        title="KPIs this can improve",
-        bullets=[
-            "Acquisition: more qualified green loan leads per RM/branch.",
-            "Approval speed: fewer document gaps; cleaner eligibility checks.",
-            "Portfolio coverage: % of MSME book with standardized sustainability data.",
-            "Monitoring: emissions trend + action adoption as engagement/risk signals.",
-        ],
+def layout_fingerprint() -> str:
+    """
+    Hash of the code that decides what a slide looks like: the theme, the
+    slide size, the add_* helpers, image variant selection and render_deck,
+    plus the placement constants. Editing the batch, report or CLI code
+    leaves it, and so every deck, unchanged.
+    """
+    layout_code = (
+        Theme,
+        _emu,
+        make_presentation,
+        _set_run_font,
+        placement_px,
+        variant_png_path,
+        placed_png,
+        render_deck,
+        *SLIDE_BUILDERS.values(),
     )
+    parts = [inspect.getsource(obj) for obj in layout_code]
+    parts.append(repr((IMAGE_SLIDE_WIDTH_IN, TWO_COL_IMAGE_WIDTH_IN, TARGET_DPI, sorted(SLIDE_BUILDERS))))
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
 
-    add_bullets_slide(
-        prs,
-        title="Pilot proposal (suggested)",
-        bullets=[
-            "Select 50–200 MSMEs across 2–3 sectors; onboard via RM-led or digital journey.",
-            "Collect baseline assessment + documents; generate standardized outputs and evidence packs.",
-            "Measure time-to-file improvement, coverage, and eligibility conversion for green products.",
-        ],
-        note="This slide is designed to be customized with your bank’s target segment and product policy rules.",
-    )
 
-    out = OUT_DIR / "Carbon_Intelligence_Bank_Pitch.pptx"
+def deck_fingerprint(spec: DeckSpec, png_manifest: dict[str, str]) -> str:
+    """
+    Hash of everything a deck is built from: its spec file, the cache keys of
+    every rendered variant of the assets it references, and the slide layout
+    code (layout_fingerprint). Only decks whose fingerprint changed are rebuilt.
+    """
+    h = hashlib.sha256(spec.path.read_bytes())
+    h.update(layout_fingerprint().encode("utf-8"))
+    for stem in spec.assets:
+        for name in sorted(png_manifest):
+            if name == f"{stem}.png" or name.startswith(f"{stem}@"):
+                h.update(f"|{name}={png_manifest[name]}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def run_deck_task(spec: DeckSpec, pngs: dict[str, Path]) -> dict:
+    """build_deck() for the pool; also times slide assembly and prs.save separately."""
+    started = time.perf_counter()
+    prs = render_deck(spec, pngs)
+    built = time.perf_counter()
+    out = OUT_DIR / spec.output
     prs.save(out)
-    return out
-
-
-def build_partners_channels_deck(pngs: dict[str, Path]) -> Path:
-    prs = make_presentation()
-    add_title_slide(
-        prs,
-        top_title="MAP Day Update",
-        line1="Carbon Intelligence",
-        line2="Key Employees / Partners / Channels",
-        footer="Internal + partner deck",
-    )
-
-    add_section_slide(prs, title="Why this exists", subtitle="Build the data → action → finance loop at scale")
-
-    add_two_col_bullets_image(
-        prs,
-        title="The mission",
-        bullets=[
-            "Help MSMEs measure emissions, reduce costs, and prove progress with audit-ready evidence.",
-            "Turn verified sustainability data into a financial primitive for green lending and portfolio reporting.",
-            "Make sustainability adoption practical: ROI-first recommendations, simple workflows, fast time-to-value.",
-        ],
-        image_path=pngs["platform-loop"],
-        image_caption="Our compounding loop: measure → improve → prove → finance",
-    )
-
-    add_image_slide(
-        prs,
-        title="What we’ve built (product snapshot)",
-        image_path=pngs["product-dashboard-web"],
-        caption="Web dashboard: score, trends, documents, reporting, and green finance workflows",
-    )
+    return {
+        "path": out,
+        "build_seconds": round(built - started, 4),
+        "save_seconds": round(time.perf_counter() - built, 4),
+    }
+
+
+def pptx_size_breakdown(path: Path) -> dict[str, int]:
+    """Compressed bytes per part type inside a .pptx (a zip package)."""
+    sizes = {"total": path.stat().st_size, "media": 0, "xml": 0, "other": 0}
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.filename.startswith("ppt/media/"):
+                sizes["media"] += info.compress_size
+            elif info.filename.endswith((".xml", ".rels")):
+                sizes["xml"] += info.compress_size
+            else:
+                sizes["other"] += info.compress_size
+    return sizes
+
+
+@dataclass
+class BuildReport:
+    """
+    Timings and sizes of one build, written as JSON by main(): per-stage
+    wall time, one entry per rasterized asset variant, per deck the
+    worker-side build/save time plus the final file size by part type, and
+    the error of every failed task. Written for failed builds too.
+    """
 
-    add_section_slide(prs, title="Who this deck is for", subtitle="Three audiences; one coherent program")
+    stages: dict[str, float] = field(default_factory=dict)
+    assets: list[dict] = field(default_factory=list)
+    decks: dict[str, dict] = field(default_factory=dict)
+    failures: dict[str, str] = field(default_factory=dict)
 
-    add_bullets_slide(
-        prs,
-        title="Audience and outcomes",
-        bullets=[
-            "Key Employees: join the team and own core product + distribution outcomes.",
-            "Partners: embed/extend the platform (consultancies, auditors, implementers, industry bodies).",
-            "Channels: drive repeatable MSME onboarding via banks, anchor enterprises, or ecosystem partners.",
-        ],
-    )
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = round(time.perf_counter() - started, 4)
+
+    def add_deck(self, name: str, path: Path, timings: dict | None = None) -> None:
+        entry: dict = {"path": str(path), "rebuilt": timings is not None}
+        if timings:
+            entry.update(build_seconds=timings["build_seconds"], save_seconds=timings["save_seconds"])
+        entry["size_bytes"] = pptx_size_breakdown(path)
+        self.decks[name] = entry
+
+    def budget_violations(self, *, max_build_seconds: float | None, max_deck_mb: float | None) -> list[str]:
+        violations = []
+        total = self.stages.get("total")
+        if max_build_seconds is not None and total is not None and total > max_build_seconds:
+            violations.append(f"build took {total:.1f}s (budget {max_build_seconds:g}s)")
+        if max_deck_mb is not None:
+            for name, deck in sorted(self.decks.items()):
+                mb = deck["size_bytes"]["total"] / (1024 * 1024)
+                if mb > max_deck_mb:
+                    violations.append(f"deck {name} is {mb:.2f} MB (budget {max_deck_mb:g} MB)")
+        return violations
+
+    def write(self, path: Path) -> None:
+        data = {"stages": self.stages, "assets": self.assets, "decks": self.decks, "failures": self.failures}
+        path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def build_all(
+    *,
+    jobs: int | None = None,
+    force: bool = False,
+    prune_defs: bool = False,
+    report: BuildReport | None = None,
+) -> tuple[list[Path], list[Path]]:
+    """
+    Runs the build as a task graph on a process pool: every stale SVG is
+    rasterized in its own task, and each deck is submitted as soon as the
+    assets it embeds are ready. Decks whose fingerprint (see
+    deck_fingerprint) matches the last build are not rebuilt unless force
+    is set.
+
+    Returns (rebuilt, up_to_date) output paths. Failures are collected per
+    task; decks whose assets failed are skipped. Raises RuntimeError
+    listing every failed task after the pool drains. Timings and sizes are
+    recorded into report when given.
+    """
+    report = report if report is not None else BuildReport()
+    specs = [load_deck_spec(name) for name in DECK_NAMES]
+    with report.stage("plan_svg_conversions"):
+        pngs, manifest, raster_jobs = plan_svg_conversions(prune_defs=prune_defs)
+    missing = Counter(job.stem for job in raster_jobs)
+    previous = load_deck_manifest()
+    deck_manifest: dict[str, str] = {}
+    failures: dict[str, BaseException] = {}
+    rebuilt: list[Path] = []
+    up_to_date: list[Path] = []
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        running: dict[Future, str] = {}
+        raster_by_future: dict[Future, RasterJob] = {}
+        for job in raster_jobs:
+            fut = pool.submit(run_raster_job, job)
+            running[fut] = f"svg:{job.png.name}"
+            raster_by_future[fut] = job
+
+        waiting = list(specs)
+        fingerprints: dict[str, str] = {}
+
+        def _submit_ready_decks() -> None:
+            for spec in list(waiting):
+                if any(stem not in pngs for stem in spec.assets):
+                    waiting.remove(spec)
+                    failures[f"deck:{spec.name}"] = KeyError(f"missing assets: {sorted(set(spec.assets) - set(pngs))}")
+                elif not any(missing[stem] for stem in spec.assets):
+                    waiting.remove(spec)
+                    fingerprint = deck_fingerprint(spec, manifest)
+                    if not force and previous.get(spec.name) == fingerprint and (OUT_DIR / spec.output).exists():
+                        deck_manifest[spec.name] = fingerprint
+                        up_to_date.append(OUT_DIR / spec.output)
+                        report.add_deck(spec.name, OUT_DIR / spec.output)
+                        continue
+                    fingerprints[spec.name] = fingerprint
+                    running[pool.submit(run_deck_task, spec, pngs)] = f"deck:{spec.name}"
+
+        _submit_ready_decks()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                task = running.pop(fut)
+                job = raster_by_future.pop(fut, None)
+                if job is not None and not raster_by_future:
+                    report.stages["convert_all_svgs"] = round(time.perf_counter() - started, 4)
+                try:
+                    result = fut.result()
+                except Exception as e:  # noqa: BLE001 - reported per task below
+                    failures[task] = e
+                    continue
+                if job is not None:
+                    missing[job.stem] -= 1
+                    manifest[job.png.name] = job.key
+                    report.assets.append(result)
+                else:
+                    name = task.removeprefix("deck:")
+                    deck_manifest[name] = fingerprints[name]
+                    rebuilt.append(result["path"])
+                    report.add_deck(name, result["path"], result)
+            _submit_ready_decks()
+    report.stages.setdefault("convert_all_svgs", 0.0)
+    report.stages["build_decks"] = round(time.perf_counter() - started, 4)
+
+    for spec in waiting:
+        failures[f"deck:{spec.name}"] = RuntimeError("skipped: an asset it embeds failed to rasterize")
+
+    save_png_manifest(manifest)
+    save_deck_manifest(deck_manifest)
+    if failures:
+        report.failures.update({task: f"{type(e).__name__}: {e}" for task, e in failures.items()})
+        details = "\n".join(f"- {task}: {message}" for task, message in sorted(report.failures.items()))
+        raise RuntimeError(f"Pitch deck build failed:\n{details}")
+    return rebuilt, up_to_date
 
-    add_section_slide(prs, title="Where we win", subtitle="Reliable evidence + simple UX + finance conversion")
-
-    add_two_col_bullets_image(
-        prs,
-        title="Evidence layer (documents) = defensibility",
-        bullets=[
-            "Bills/invoices become structured data with audit trail.",
-            "Duplicate detection reduces errors and strengthens trust.",
-            "Creates repeatable ‘evidence packs’ for buyers, auditors, and lenders.",
-        ],
-        image_path=pngs["product-document-management"],
-    )
 
-    add_two_col_bullets_image(
-        prs,
-        title="Reporting that stakeholders actually consume",
-        bullets=[
-            "Standardized outputs: total CO₂, category split, scope 1/2/3, score and trend.",
-            "Exports for buyers, internal teams, and bank/portfolio reporting.",
-            "Action adoption tracked over time (progress, payback, impact).",
-        ],
-        image_path=pngs["product-reporting"],
-    )
+@dataclass(frozen=True)
+class Personalization:
+    """
+    One co-branded deck to generate in batch mode. `fields` holds every
+    text value of the record and fills matching {{name}} tokens in the
+    template; cobrand_spec only adds {{partner}} and {{footer}}, so other
+    fields need a token written into the deck spec. `slides` keeps only
+    those 1-based slide numbers of the base deck; `metrics` become a
+    closing "Key metrics" bullets slide.
+    """
 
-    add_two_col_bullets_image(
-        prs,
-        title="Finance conversion (green lending workflow)",
-        bullets=[
-            "Eligibility and term preview driven by policy rules + verified data.",
-            "Cleaner files reduce back-and-forth and speed approvals.",
-            "Monitoring ties capital deployment to measurable reduction outcomes.",
-        ],
-        image_path=pngs["product-green-loans"],
-    )
+    deck: str
+    output: str
+    fields: dict[str, str]
+    slides: tuple[int, ...] | None = None
+    metrics: tuple[tuple[str, str], ...] = ()
 
-    add_section_slide(prs, title="Key employees", subtitle="What we’re hiring for (and why it’s exciting)")
-
-    add_bullets_slide(
-        prs,
-        title="Roles we typically need (adapt as needed)",
-        bullets=[
-            "Product + Engineering: workflows, evidence layer, integrations, reporting/export.",
-            "Data/ML: extraction quality, dedup, carbon estimation models, benchmarks.",
-            "Growth + Partnerships: bank/anchor programs, onboarding playbooks, channel enablement.",
-            "Customer Success: repeatable onboarding, retention/expansion, outcome reporting (₹ savings + CO₂).",
-        ],
-        note="Replace this slide with your exact open roles and seniority.",
-    )
 
-    add_bullets_slide(
-        prs,
-        title="Why a key employee should join",
-        bullets=[
-            "Mission + measurable outcomes: help MSMEs cut costs while meeting compliance pressure.",
-            "Real product in place: ship on a working workflow system (not a concept).",
-            "Distribution leverage: banks and anchor enterprises can onboard thousands via programs.",
-            "Compounding advantage: better evidence → better data → better decisions → better finance conversion.",
-        ],
-    )
+def _parse_slide_numbers(value: object) -> tuple[int, ...] | None:
+    # Accepts [1, 2, 5] (JSONL) or "1-3,5" (CSV).
+    if value in (None, ""):
+        return None
+    if isinstance(value, list):
+        return tuple(int(v) for v in value)
+    numbers: list[int] = []
+    for part in str(value).split(","):
+        lo, _, hi = part.strip().partition("-")
+        numbers.extend(range(int(lo), int(hi or lo) + 1))
+    return tuple(numbers)
 
-    add_section_slide(prs, title="Partners", subtitle="Who we work with and what they gain")
-
-    add_bullets_slide(
-        prs,
-        title="Partner types (examples)",
-        bullets=[
-            "Sustainability consultants / implementers (baseline → roadmap → execution).",
-            "Auditors / verifiers (evidence packs + standardized outputs).",
-            "Industry associations (member onboarding programs).",
-            "Solution providers (solar/efficiency/waste) who need qualified demand + proof.",
-        ],
-    )
 
-    add_bullets_slide(
-        prs,
-        title="Partner value proposition",
-        bullets=[
-            "Faster delivery: standardized workflows and reporting reduce manual effort.",
-            "Higher trust: document-backed evidence improves auditability and buyer/lender confidence.",
-            "More revenue: partners can bundle services around recommendations and implementation.",
-            "Clear packaging: tiered engagement templates (assessment → action plan → monitoring).",
-        ],
-    )
+def _slug(text: str) -> str:
+    return "".join(ch if ch.isalnum() else "_" for ch in text).strip("_") or "deck"
 
-    add_section_slide(prs, title="Channels", subtitle="Repeatable acquisition and onboarding")
 
-    add_bullets_slide(
-        prs,
-        title="Channel models (how leads come in)",
-        bullets=[
-            "Bank channel: RMs / digital journeys for green lending and portfolio monitoring.",
-            "Anchor enterprise channel: supply-chain compliance programs (vendor onboarding).",
-            "Ecosystem channel: associations, platforms, and service providers referring MSMEs.",
-        ],
-    )
-
-    add_bullets_slide(
-        prs,
-        title="Channel motion (recommended)",
-        bullets=[
-            "Step 1: MSME invite → lightweight onboarding + baseline assessment.",
-            "Step 2: Document upload → evidence pack + data cleanliness checks.",
-            "Step 3: Report export → buyer/bank-ready output (shareable).",
-            "Step 4: Action plan → track ROI + implementation status.",
-            "Step 5: Finance conversion (optional) → eligibility + application workflow.",
-        ],
-    )
-
-    add_bullets_slide(
-        prs,
-        title="What channels need from us (enablement kit)",
-        bullets=[
-            "Co-branded landing + onboarding journey.",
-            "Sector-specific templates (inputs, recommended actions, ROI assumptions).",
-            "Partner portal: cohort tracking, export packs, and progress dashboards.",
-            "Training: talk track, demo script, objection handling, and ROI calculator.",
-        ],
-    )
-
-    add_section_slide(prs, title="How we measure success", subtitle="Simple KPIs per audience")
-
-    add_bullets_slide(
-        prs,
-        title="KPIs",
-        bullets=[
-            "Acquisition: invited → activated MSMEs; CAC by channel; time-to-first-report.",
-            "Engagement: documents processed; exports; action adoption rate.",
-            "Outcomes: ₹ savings realized; kg CO₂ reduced; score improvement.",
-            "Finance: eligibility rate; application completion; approval speed; portfolio coverage.",
-        ],
-    )
+def read_personalization_records(path: Path) -> list[Personalization]:
+    """
+    Reads personalization records from a .jsonl or .csv file.
 
-    add_bullets_slide(
-        prs,
-        title="Next steps (choose your path)",
-        bullets=[
-            "Key employees: share your role fit + a 30/60/90 plan you’d execute.",
-            "Partners: propose 1–2 packaged offerings you can deliver using the platform.",
-            "Channels: select a pilot cohort size and define the onboarding + reporting workflow.",
-        ],
-        note="This deck is designed to be customized per audience and partner type.",
-    )
+    Each record needs "deck" (a spec name, e.g. "bank" or "msme") and
+    "partner". Optional: "footer", "slides", "output", and metrics, either
+    as a JSON object under "metrics" or as CSV columns named "metric:<label>".
+    Any other text column fills a {{column}} token, but only where a deck
+    spec contains one; the base specs carry just {{partner}} and {{footer}}.
+    """
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with path.open(encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    records: list[Personalization] = []
+    outputs: set[str] = set()
+    specs: dict[str, DeckSpec] = {}
+    for n, row in enumerate(rows, start=1):
+        if not all(isinstance(k, str) for k in row):
+            # csv.DictReader files cells beyond the header under a None key.
+            raise ValueError(f"{path}: record {n} has more cells than the header has columns")
+        try:
+            deck = row["deck"]
+            partner = row["partner"]
+        except KeyError as e:
+            raise ValueError(f"{path}: record {n} is missing {e.args[0]!r}") from None
+        if deck not in DECK_NAMES:
+            raise ValueError(f"{path}: record {n} has unknown deck {deck!r}")
+
+        metrics = row.get("metrics") or {}
+        if isinstance(metrics, str):
+            metrics = json.loads(metrics)
+        metrics = dict(metrics)
+        metrics.update({k[len("metric:") :]: v for k, v in row.items() if k.startswith("metric:") and v})
+        fields = {
+            k: str(v)
+            for k, v in row.items()
+            if k not in ("deck", "slides", "output", "metrics") and not k.startswith("metric:") and v is not None
+        }
+        fields.setdefault("footer", "")
+        fields["footer"] = fields["footer"] or f"Prepared for {partner}"
+
+        if deck not in specs:
+            specs[deck] = load_deck_spec(deck)
+        output = row.get("output") or f"{Path(specs[deck].output).stem}__{_slug(partner)}.pptx"
+        if Path(output).is_absolute() or len(Path(output).parts) != 1 or "\\" in output or output in (".", ".."):
+            raise ValueError(f"{path}: record {n} has output {output!r}; it must be a plain file name")
+        if output in outputs:
+            raise ValueError(f"{path}: record {n} would overwrite {output}; set a distinct 'output'")
+        outputs.add(output)
 
-    out = OUT_DIR / "Carbon_Intelligence_Key_Employees_Partners_Channels_Pitch.pptx"
+        try:
+            slides = _parse_slide_numbers(row.get("slides"))
+        except (TypeError, ValueError):
+            raise ValueError(f"{path}: record {n} has slides {row['slides']!r}; use e.g. [1, 2, 5] or \"1-3,5\"") from None
+        count = len(specs[deck].slides)
+        if slides is not None and (not slides or not all(1 <= s <= count for s in slides)):
+            raise ValueError(f"{path}: record {n} has slides {row['slides']!r}; the {deck} deck has slides 1-{count}")
+
+        records.append(
+            Personalization(
+                deck=deck,
+                output=output,
+                fields=fields,
+                slides=slides,
+                metrics=tuple((str(k), str(v)) for k, v in metrics.items()),
+            )
+        )
+    return records
+
+
+def cobrand_spec(spec: DeckSpec) -> DeckSpec:
+    """Adds {{partner}} / {{footer}} tokens to the title slide of a base deck."""
+    slides = []
+    for slide in spec.slides:
+        if slide["type"] == "title":
+            slide = {**slide, "line1": f"{slide['line1']} × {{{{partner}}}}", "footer": "{{footer}}"}
+        slides.append(slide)
+    return DeckSpec(name=spec.name, output=spec.output, slides=tuple(slides))
+
+
+def _fill_tokens(prs: Presentation, fields: dict[str, str]) -> None:
+    # Slide helpers write each text as a single run, so tokens never span runs.
+    tokens = {f"{{{{{k}}}}}": v for k, v in fields.items()}
+    for slide in prs.slides:
+        for shape in slide.shapes:
+            if not shape.has_text_frame:
+                continue
+            for para in shape.text_frame.paragraphs:
+                for run in para.runs:
+                    if "{{" in run.text:
+                        text = run.text
+                        for token, value in tokens.items():
+                            text = text.replace(token, value)
+                        run.text = text
+
+
+def _keep_slides(prs: Presentation, numbers: tuple[int, ...]) -> None:
+    keep = set(numbers)
+    id_list = prs.slides._sldIdLst  # python-pptx has no public slide removal
+    for number, sld_id in reversed(list(enumerate(id_list, start=1))):
+        if number not in keep:
+            prs.part.drop_rel(sld_id.rId)
+            id_list.remove(sld_id)
+
+
+_BATCH_TEMPLATES: dict[str, bytes] = {}
+
+
+def _init_batch_worker(templates: dict[str, bytes]) -> None:
+    _BATCH_TEMPLATES.update(templates)
+
+
+def personalize_deck(record: Personalization, out_dir: Path) -> Path:
+    """Clones the pre-rendered template for record.deck, fills it and saves it."""
+    prs = Presentation(io.BytesIO(_BATCH_TEMPLATES[record.deck]))
+    if record.slides is not None:
+        _keep_slides(prs, record.slides)
+    if record.metrics:
+        add_bullets_slide(prs, title="Key metrics", bullets=[f"{k}: {v}" for k, v in record.metrics])
+    _fill_tokens(prs, record.fields)
+
+    out = out_dir / record.output
     prs.save(out)
     return out
 
 
-def main() -> None:
-    ensure_dirs()
-    pngs = convert_all_svgs()
+def build_batch(
+    records_path: Path, out_dir: Path, *, jobs: int | None = None, prune_defs: bool = False
+) -> list[Path]:
+    """
+    Generates one co-branded deck per personalization record. Each base deck
+    is rendered once into an in-memory template (images embedded); workers
+    receive the templates once at start-up, then only clone and fill them
+    per record and write straight into out_dir.
+    """
+    records = read_personalization_records(records_path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pngs = convert_all_svgs(prune_defs=prune_defs)
+
+    templates: dict[str, bytes] = {}
+    for deck in sorted({r.deck for r in records}):
+        buf = io.BytesIO()
+        render_deck(cobrand_spec(load_deck_spec(deck)), pngs).save(buf)
+        templates[deck] = buf.getvalue()
+
+    written: list[Path] = []
+    failures: dict[str, BaseException] = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker, initargs=(templates,)) as pool:
+        futures = {pool.submit(personalize_deck, record, out_dir): record.output for record in records}
+        for fut in as_completed(futures):
+            try:
+                written.append(fut.result())
+            except Exception as e:  # noqa: BLE001 - reported per record below
+                failures[futures[fut]] = e
+
+    if failures:
+        details = "\n".join(f"- {name}: {type(e).__name__}: {e}" for name, e in sorted(failures.items()))
+        raise RuntimeError(f"{len(failures)} of {len(records)} personalized decks failed:\n{details}")
+    return written
+
 
-    outputs = [
-        build_investor_deck(pngs),
-        build_msme_deck(pngs),
-        build_bank_deck(pngs),
-        build_partners_channels_deck(pngs),
-    ]
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--force", action="store_true", help="rebuild every deck, even if up to date")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--prune-defs", action="store_true", help="drop unreferenced <defs> entries before rasterizing")
+    parser.add_argument("--batch", type=Path, help="CSV/JSONL of personalization records to build co-branded decks from")
+    parser.add_argument("--out-dir", type=Path, default=OUT_DIR / "personalized", help="output directory for --batch")
+    parser.add_argument("--report", type=Path, default=BUILD_REPORT, help="where to write the JSON build report")
+    parser.add_argument("--max-build-seconds", type=float, default=None, help="fail if the build takes longer")
+    parser.add_argument("--max-deck-mb", type=float, default=None, help="fail if any deck is larger")
+    args = parser.parse_args()
+
+    if args.batch:
+        ensure_dirs()
+        started = time.perf_counter()
+        written = build_batch(args.batch, args.out_dir, jobs=args.jobs, prune_defs=args.prune_defs)
+        elapsed = time.perf_counter() - started
+        print(f"Generated {len(written)} decks in {args.out_dir} ({elapsed:.1f}s, {len(written) / elapsed:.1f} decks/s)")
+        return
+
+    report = BuildReport()
+    try:
+        with report.stage("total"):
+            with report.stage("ensure_dirs"):
+                ensure_dirs()
+            rebuilt, up_to_date = build_all(jobs=args.jobs, force=args.force, prune_defs=args.prune_defs, report=report)
+    except Exception as e:
+        if not report.failures:  # failed outside the task graph
+            report.failures["build"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        report.write(args.report)
 
     print("Generated:")
-    for p in outputs:
+    for p in rebuilt:
         print(f"- {p}")
+    if up_to_date:
+        print("Up to date:")
+        for p in up_to_date:
+            print(f"- {p}")
+    print(f"Build report: {args.report} ({report.stages['total']:.1f}s)")
+
+    violations = report.budget_violations(max_build_seconds=args.max_build_seconds, max_deck_mb=args.max_deck_mb)
+    if violations:
+        raise SystemExit("Performance budget exceeded:\n" + "\n".join(f"- {v}" for v in violations))
 
 
 if __name__ == "__main__":